@@ -1,14 +1,23 @@
 ﻿import os
+import re
 import csv
 import time
+import asyncio
+from dataclasses import dataclass
+from operator import itemgetter
+from urllib.parse import quote
+import aiohttp
+import orjson
 from dotenv import load_dotenv
 from pyairtable import Api
+from lookup_cache import load_lookup, save_lookup
 
 load_dotenv()
 
 AIRTABLE_TOKEN = os.getenv("AIRTABLE_TOKEN")
 AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
 CSV_PATH = os.getenv("CSV_PATH", "Biotech_VC_All_polished_one_sheet.csv")
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "synced.jsonl")
 
 if not AIRTABLE_TOKEN or not AIRTABLE_BASE_ID:
     raise SystemExit("Missing credentials in .env")
@@ -20,152 +29,447 @@ firms_table = base.table("Venture Capital Firms")
 therapeutic_table = base.table("Therapeutic Areas")
 geography_table = base.table("Geographic Regions")
 
+class TokenBucket:
+    def __init__(self, rate=5, capacity=5):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _take(self):
+        # Returns 0 once a token is taken, otherwise the seconds until one is available
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def hold(self, seconds):
+        # Push the bucket into debt so no caller gets a token for `seconds`;
+        # overlapping holds don't add up, the longest one wins
+        self._refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+    async def acquire_async(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while wait := self._take():
+                await asyncio.sleep(wait)
+
+# Airtable allows 5 requests/second per base
+RATE = TokenBucket()
+
+@dataclass(slots=True)
+class Row:
+    firm: str
+    website: str
+    hq_city_state: str
+    hq_country: str
+    therapeutic_areas: str
+    geography_focus: str
+    aum_usd: str
+    typical_check_size_usd: str
+    description: str
+    verified: str
+
+# CSV header for each Row attribute
+CSV_COLUMNS = {
+    "firm": "Firm",
+    "website": "Website",
+    "hq_city_state": "HQ City/State",
+    "hq_country": "HQ Country",
+    "therapeutic_areas": "Therapeutic Areas",
+    "geography_focus": "Geography Focus",
+    "aum_usd": "AUM (USD)",
+    "typical_check_size_usd": "Typical Check Size (USD)",
+    "description": "Description",
+    "verified": "Verified",
+}
+
+# Row attribute -> Airtable field
 FIELD_MAP = {
-    "Firm": "Firm Name",
-    "Website": "Website",
-    "HQ City/State": "Headquarters City/State",
-    "AUM (USD)": "Assets Under Management (USD)",
-    "Typical Check Size (USD)": "Typical Check Size (USD)",
-    "Description": "Description",
-    "Verified": "Verified",
+    "firm": "Firm Name",
+    "website": "Website",
+    "hq_city_state": "Headquarters City/State",
+    "aum_usd": "Assets Under Management (USD)",
+    "typical_check_size_usd": "Typical Check Size (USD)",
+    "description": "Description",
+    "verified": "Verified",
 }
 
+LINK_FIELDS = ["Therapeutic Areas of Focus", "Geography Focus", "Headquarters Country"]
+# Every field to_payload writes; fetched back to detect unchanged firms
+SYNC_FIELDS = list(FIELD_MAP.values()) + LINK_FIELDS
+
+AIRTABLE_API_URL = "https://api.airtable.com/v0"
+# Airtable's bulk endpoints accept at most 10 records per request
+BATCH_SIZE = 10
+MAX_CONCURRENT_REQUESTS = 5
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Batches queued ahead of the semaphore while the CSV is still being read
+MAX_PENDING_BATCHES = 2 * MAX_CONCURRENT_REQUESTS
+MAX_RETRIES = 5
+# Airtable locks the base for 30 seconds after a 429
+RATE_LIMIT_WAIT = 30
+
+_BLANKS = frozenset(("tbd", "unknown", "n/a", ""))
+_TRUE = frozenset(("true", "1", "yes", "y"))
+_FALSE = frozenset(("false", "0", "no", "n", ""))
+_SEP = re.compile(r"[,;]")
+
 def sanitize(v):
-    if v is None:
-        return None
     if isinstance(v, str):
         s = v.strip()
-        return None if s == "" or s.lower() in ("tbd", "unknown", "n/a") else s
+        return None if s.lower() in _BLANKS else s
     return v
 
 def compute_verified(row):
-    w = (row.get("Website") or "").strip().lower()
-    city = (row.get("HQ City/State") or "").strip().lower()
-    return bool(w.startswith("http") and city not in ("", "tbd", "unknown", "n/a"))
+    w = row.website.strip().lower()
+    city = row.hq_city_state.strip().lower()
+    return bool(w.startswith("http") and city not in _BLANKS)
 
 def load_csv_rows(path):
-    rows = []
     with open(path, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            rr = {c: r.get(c, "") for c in reader.fieldnames or []}
-            if not rr.get("Verified"):
-                rr["Verified"] = "true" if compute_verified(rr) else "false"
-            rows.append(rr)
-    return rows
+        reader = csv.reader(f)
+        header = next(reader, [])
+        n_cols = len(header)
+        idx = {name: i for i, name in enumerate(header)}
+        # Columns missing from the header read the "" appended to every row
+        get_values = itemgetter(*(idx.get(CSV_COLUMNS[attr], -1) for attr in Row.__slots__))
+        for values in reader:
+            if not values:
+                continue
+            if len(values) < n_cols:
+                values += [""] * (n_cols - len(values))
+            values.append("")
+            row = Row(*get_values(values))
+            if not row.verified:
+                row.verified = "true" if compute_verified(row) else "false"
+            yield row
 
 def parse_list_field(value):
+    # Returns (lowercased key, original) pairs so callers never re-lowercase
     if not value or not isinstance(value, str):
         return []
-    cleaned = value.replace(";", ",")
-    items = [item.strip() for item in cleaned.split(",")]
-    return [item for item in items if item and item.lower() not in ("tbd", "unknown", "n/a", "")]
-
-def get_or_create_lookup_table(table, name_field, items):
-    mapping = {}
-    print(f"  Fetching existing {table.name} records...")
-    existing = table.all()
-    for rec in existing:
-        name = rec.get("fields", {}).get(name_field)
-        if name:
-            mapping[name.strip().lower()] = rec["id"]
+    pairs = []
+    for item in _SEP.split(value):
+        item = item.strip()
+        key = item.lower()
+        if key not in _BLANKS:
+            pairs.append((key, item))
+    return pairs
+
+def chunked(items, size=BATCH_SIZE):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def table_url(table):
+    return f"{AIRTABLE_API_URL}/{AIRTABLE_BASE_ID}/{quote(table.name, safe='')}"
+
+def retry_after_seconds(headers, default):
+    try:
+        return max(float(headers.get("Retry-After", "")), 0)
+    except ValueError:
+        return default
+
+async def airtable_request(session, method, url, payload):
+    data = orjson.dumps(payload)
+    # A POST that fails after reaching Airtable may already have created its records,
+    # so only PATCH is retried on 5xx and dropped connections
+    idempotent = method != "POST"
+    for attempt in range(MAX_RETRIES + 1):
+        await RATE.acquire_async()
+        try:
+            async with session.request(method, url, data=data, headers=JSON_HEADERS) as resp:
+                status = resp.status
+                body = await resp.read()
+                wait = retry_after_seconds(resp.headers, RATE_LIMIT_WAIT if status == 429 else 2 ** attempt)
+        except aiohttp.ClientError as e:
+            never_sent = isinstance(e, aiohttp.ClientConnectorError)
+            if attempt == MAX_RETRIES or not (idempotent or never_sent):
+                raise
+            print(f"    {method} failed ({e}); retrying in {2 ** attempt}s")
+            await asyncio.sleep(2 ** attempt)
+            continue
+        if status == 429 or (status >= 500 and idempotent):
+            if attempt == MAX_RETRIES:
+                raise RuntimeError(f"{status} {body.decode(errors='replace')[:200]}")
+            print(f"    {method} got {status}; retrying in {wait:g}s")
+            if status == 429:
+                # Stop every pending request, not just this one, until the lockout ends
+                RATE.hold(wait)
+            else:
+                await asyncio.sleep(wait)
+            continue
+        if status >= 400:
+            raise RuntimeError(f"{status} {body.decode(errors='replace')[:200]}")
+        return orjson.loads(body)
+
+async def create_lookup_batch(session, sem, url, name_field, batch, mapping):
+    records = [{"fields": {name_field: item}} for _, item in batch]
+    async with sem:
+        try:
+            body = await airtable_request(session, "POST", url, {"records": records, "typecast": True})
+        except Exception as e:
+            print(f"    ERROR creating {', '.join(repr(item) for _, item in batch)}: {e}")
+            return [key for key, _ in batch]
+    for (key, item), rec in zip(batch, body["records"]):
+        mapping[key] = rec["id"]
+        print(f"    + Created '{item}'")
+    return []
+
+async def get_or_create_lookup_table(session, sem, table, name_field, items, cache_key):
+    names = load_lookup(AIRTABLE_BASE_ID, cache_key)
+    if names is None:
+        names = {}
+        print(f"  Fetching existing {table.name} records...")
+        # Paginated reads stay on pyairtable, whose retry policy handles 429s
+        existing = await asyncio.to_thread(table.all, fields=[name_field], page_size=100)
+        for rec in existing:
+            name = rec.get("fields", {}).get(name_field)
+            if name:
+                names[rec["id"]] = name
+        save_lookup(AIRTABLE_BASE_ID, cache_key, names)
+    else:
+        print(f"  Using cached {table.name} records")
+    mapping = {name.strip().lower(): rec_id for rec_id, name in names.items()}
     print(f"  Found {len(mapping)} existing records")
-    to_create = []
-    for item in items:
-        if item.lower() not in mapping:
-            to_create.append(item)
+    to_create = [(key, item) for key, item in items.items() if key not in mapping]
+    failed = set()
     if to_create:
         print(f"  Creating {len(to_create)} new records...")
-        for item in to_create:
-            try:
-                rec = table.create({name_field: item})
-                mapping[item.lower()] = rec["id"]
-                print(f"    + Created '{item}'")
-                time.sleep(0.21)
-            except Exception as e:
-                print(f"    ERROR creating '{item}': {e}")
-    return mapping
-
-def setup_linked_records(rows):
+        url = table_url(table)
+        results = await asyncio.gather(*[
+            create_lookup_batch(session, sem, url, name_field, batch, mapping)
+            for batch in chunked(to_create)
+        ])
+        failed.update(key for keys in results for key in keys)
+        names.update((mapping[key], item) for key, item in to_create if key in mapping)
+        save_lookup(AIRTABLE_BASE_ID, cache_key, names, refreshed=False)
+    return mapping, failed
+
+async def setup_linked_records(session, sem, rows):
     print("\n=== Setting up Linked Record Tables ===")
-    all_therapeutics = set()
-    all_geographies = set()
-    all_countries = set()
+    # lowercased key -> spelling as written in the CSV
+    all_therapeutics = {}
+    all_geographies = {}
+    all_countries = {}
+    n_rows = 0
     for r in rows:
-        all_therapeutics.update(parse_list_field(r.get("Therapeutic Areas")))
-        all_geographies.update(parse_list_field(r.get("Geography Focus")))
-        all_countries.update(parse_list_field(r.get("HQ Country")))
+        n_rows += 1
+        all_therapeutics.update(parse_list_field(r.therapeutic_areas))
+        all_geographies.update(parse_list_field(r.geography_focus))
+        all_countries.update(parse_list_field(r.hq_country))
+    print(f"Loaded {n_rows} rows")
     print(f"\nFound {len(all_therapeutics)} unique therapeutic areas")
     print(f"Found {len(all_geographies)} unique geography focuses")
     print(f"Found {len(all_countries)} unique countries")
     
     # Use correct field names
-    therapeutic_map = get_or_create_lookup_table(therapeutic_table, "Therapeutic Area Name", all_therapeutics)
-    geography_map = get_or_create_lookup_table(geography_table, "Region Name", all_geographies | all_countries)
+    therapeutic_map, therapeutic_failed = await get_or_create_lookup_table(session, sem, therapeutic_table, "Therapeutic Area Name", all_therapeutics, "therapeutic_map")
+    geography_map, geography_failed = await get_or_create_lookup_table(session, sem, geography_table, "Region Name", all_geographies | all_countries, "geo_map")
     
-    return therapeutic_map, geography_map
-
-def to_payload(csv_row, therapeutic_map, geography_map):
-    payload = {}
-    for csv_name, airtable_name in FIELD_MAP.items():
-        v = sanitize(csv_row.get(csv_name))
-        if airtable_name == "Verified" and isinstance(v, str):
-            v_lower = v.strip().lower()
-            v = True if v_lower in ("true", "1", "yes", "y") else False if v_lower in ("false", "0", "no", "n", "") else v
-        payload[airtable_name] = v
-    therapeutic_items = parse_list_field(csv_row.get("Therapeutic Areas"))
-    therapeutic_ids = [therapeutic_map.get(item.lower()) for item in therapeutic_items if therapeutic_map.get(item.lower())]
+    return therapeutic_map, geography_map, (therapeutic_failed, geography_failed)
+
+def references_failed_lookup(row, failed_lookups):
+    failed_therapeutics, failed_geographies = failed_lookups
+    if any(key in failed_therapeutics for key, _ in parse_list_field(row.therapeutic_areas)):
+        return True
+    geo_items = parse_list_field(row.geography_focus) + parse_list_field(row.hq_country)
+    return any(key in failed_geographies for key, _ in geo_items)
+
+def to_payload(row, therapeutic_map, geography_map):
+    payload = {airtable_name: sanitize(getattr(row, attr)) for attr, airtable_name in FIELD_MAP.items()}
+    v = payload["Verified"]
+    if isinstance(v, str):
+        v_lower = v.lower()
+        payload["Verified"] = True if v_lower in _TRUE else False if v_lower in _FALSE else v
+    therapeutic_items = parse_list_field(row.therapeutic_areas)
+    therapeutic_ids = [rec_id for key, _ in therapeutic_items if (rec_id := therapeutic_map.get(key)) is not None]
     if therapeutic_ids:
         payload["Therapeutic Areas of Focus"] = therapeutic_ids
-    geo_items = parse_list_field(csv_row.get("Geography Focus"))
-    geo_ids = [geography_map.get(item.lower()) for item in geo_items if geography_map.get(item.lower())]
+    geo_items = parse_list_field(row.geography_focus)
+    geo_ids = [rec_id for key, _ in geo_items if (rec_id := geography_map.get(key)) is not None]
     if geo_ids:
         payload["Geography Focus"] = geo_ids
-    country_items = parse_list_field(csv_row.get("HQ Country"))
-    country_ids = [geography_map.get(item.lower()) for item in country_items if geography_map.get(item.lower())]
+    country_items = parse_list_field(row.hq_country)
+    country_ids = [rec_id for key, _ in country_items if (rec_id := geography_map.get(key)) is not None]
     if country_ids:
         payload["Headquarters Country"] = country_ids
     return payload
 
+def normalize_fields(fields):
+    # Airtable omits empty cells and unchecked boxes and returns numbers as numbers,
+    # so drop empties and compare scalars as strings
+    return {
+        k: v if isinstance(v, list) else str(v)
+        for k, v in fields.items()
+        if v not in (None, False, "", [])
+    }
+
+def is_unchanged(current, payload):
+    wanted = normalize_fields(payload)
+    # to_payload leaves out blank/unresolved link fields, so the update won't touch them either
+    current = {k: v for k, v in current.items() if k in wanted or k not in LINK_FIELDS}
+    return current == wanted
+
 def index_existing_firms():
     existing = {}
+    current_fields = {}
     print("Fetching existing VC firms...")
-    all_records = firms_table.all(fields=["Firm Name"])
+    all_records = firms_table.all(fields=SYNC_FIELDS, page_size=100)
     for rec in all_records:
-        firm = rec.get("fields", {}).get("Firm Name")
+        fields = rec.get("fields", {})
+        firm = fields.get("Firm Name")
         if firm:
             existing[str(firm).strip().lower()] = rec["id"]
+            current_fields[rec["id"]] = normalize_fields(fields)
     print(f"Found {len(existing)} existing firms")
-    return existing
+    return existing, current_fields
+
+def load_checkpoint(path):
+    # Firm keys written by an earlier run that was aborted
+    done = set()
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    done.add(orjson.loads(line)["firm"])
+                except (orjson.JSONDecodeError, KeyError, TypeError):
+                    continue  # torn last line from an interrupted write
+    except FileNotFoundError:
+        pass
+    return done
+
+def record_checkpoint(checkpoint, keys, op):
+    ts = time.time()
+    checkpoint.write(b"".join(orjson.dumps({"firm": k, "op": op, "ts": ts}) + b"\n" for k in keys))
+    checkpoint.flush()
+    os.fsync(checkpoint.fileno())
+
+async def send_update_batch(session, sem, url, batch, checkpoint):
+    records = [{"id": rec_id, "fields": payload} for rec_id, (_, payload) in batch]
+    async with sem:
+        try:
+            await airtable_request(session, "PATCH", url, {"records": records, "typecast": True})
+        except Exception as e:
+            print(f"  ERROR updating {len(records)} records: {str(e)[:80]}")
+            return 0, 0, len(records)
+    record_checkpoint(checkpoint, [key_val for _, (key_val, _) in batch], "update")
+    print(f"  Updated {len(records)} records...")
+    return len(records), 0, 0
+
+async def send_create_batch(session, sem, url, batch, existing, checkpoint):
+    records = [{"fields": payload} for _, (_, payload) in batch]
+    async with sem:
+        try:
+            body = await airtable_request(session, "POST", url, {"records": records, "typecast": True})
+        except Exception as e:
+            print(f"  ERROR creating {len(records)} records: {str(e)[:80]}")
+            return 0, 0, len(records)
+    record_checkpoint(checkpoint, [key_val for key_val, _ in batch], "create")
+    for (key_val, (firm_name, _)), rec in zip(batch, body["records"]):
+        existing[key_val] = rec["id"]
+        print(f"  + Created '{firm_name}'")
+    return 0, len(records), 0
+
+def tally(done, in_flight, totals):
+    in_flight.difference_update(done)
+    for task in done:
+        for i, n in enumerate(task.result()):
+            totals[i] += n
 
-def upsert_firms(rows, therapeutic_map, geography_map):
+async def submit(in_flight, totals, coro):
+    while len(in_flight) >= MAX_PENDING_BATCHES:
+        done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        tally(done, in_flight, totals)
+    in_flight.add(asyncio.create_task(coro))
+
+async def settle(in_flight, totals):
+    if in_flight:
+        done, _ = await asyncio.wait(in_flight)
+        tally(done, in_flight, totals)
+
+async def upsert_firms_async(session, sem, rows, therapeutic_map, geography_map, failed_lookups, checkpoint):
     print("\n=== Syncing VC Firms ===")
-    existing = index_existing_firms()
-    creates = 0
-    updates = 0
-    errors = 0
-    for idx, r in enumerate(rows, start=1):
-        firm_name = (r.get("Firm") or "").strip()
+    # Blocking pyairtable read (429s handled by its retry policy); keep it off the event loop
+    existing, current_fields = await asyncio.to_thread(index_existing_firms)
+    done = load_checkpoint(CHECKPOINT_PATH)
+    if done:
+        print(f"Resuming: skipping {len(done)} firms synced by the previous run")
+    url = table_url(firms_table)
+    totals = [0, 0, 0]  # updated, created, errors
+    unchanged = 0
+    in_flight = set()
+    # Keyed by record id / firm key so duplicate rows within a batch collapse to the last one
+    updates_batch = {}
+    creates_batch = {}
+    sent_creates = set()
+    repeats = {}
+    for r in rows:
+        firm_name = r.firm.strip()
         if not firm_name:
             continue
         key_val = firm_name.lower()
+        if key_val in done:
+            continue
+        if any(failed_lookups) and references_failed_lookup(r, failed_lookups):
+            # Syncing now would drop the link; leave the firm for a later run
+            print(f"  ERROR '{firm_name}': a linked lookup record could not be created")
+            totals[2] += 1
+            continue
         payload = to_payload(r, therapeutic_map, geography_map)
-        try:
-            if key_val in existing:
-                firms_table.update(existing[key_val], payload)
-                updates += 1
-                if idx % 20 == 0:
-                    print(f"  Updated {updates} records...")
-            else:
-                rec = firms_table.create(payload)
-                existing[key_val] = rec["id"]
-                creates += 1
-                print(f"  + Created '{firm_name}'")
-            time.sleep(0.21)
-        except Exception as e:
-            errors += 1
-            print(f"  ERROR Row {idx} '{firm_name}': {str(e)[:80]}")
-    return updates, creates, errors
+        if key_val in existing:
+            rec_id = existing[key_val]
+            if rec_id in current_fields and is_unchanged(current_fields[rec_id], payload):
+                # Nothing to write; also drop an earlier queued row for the same firm
+                updates_batch.pop(rec_id, None)
+                unchanged += 1
+                continue
+            updates_batch[rec_id] = (key_val, payload)
+        elif key_val in sent_creates:
+            # Create already sent; update the record once its id is known
+            repeats[key_val] = payload
+        else:
+            creates_batch[key_val] = (firm_name, payload)
+        if len(updates_batch) >= BATCH_SIZE:
+            await submit(in_flight, totals, send_update_batch(session, sem, url, list(updates_batch.items()), checkpoint))
+            updates_batch = {}
+        if len(creates_batch) >= BATCH_SIZE:
+            sent_creates.update(creates_batch)
+            await submit(in_flight, totals, send_create_batch(session, sem, url, list(creates_batch.items()), existing, checkpoint))
+            creates_batch = {}
+    if creates_batch:
+        await submit(in_flight, totals, send_create_batch(session, sem, url, list(creates_batch.items()), existing, checkpoint))
+    await settle(in_flight, totals)
+    for key_val, payload in repeats.items():
+        if key_val in existing:
+            updates_batch[existing[key_val]] = (key_val, payload)
+        else:
+            totals[2] += 1
+    for batch in chunked(list(updates_batch.items())):
+        await submit(in_flight, totals, send_update_batch(session, sem, url, batch, checkpoint))
+    await settle(in_flight, totals)
+    updates, creates, errors = totals
+    return updates, creates, unchanged, errors
+
+async def run_sync(path):
+    headers = {"Authorization": f"Bearer {AIRTABLE_TOKEN}"}
+    connector = aiohttp.TCPConnector(limit=8)
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Two streaming passes over the file: lookup records must exist before firm payloads can link to them
+        therapeutic_map, geography_map, failed_lookups = await setup_linked_records(session, sem, load_csv_rows(path))
+        with open(CHECKPOINT_PATH, "ab") as checkpoint:
+            return await upsert_firms_async(
+                session, sem, load_csv_rows(path), therapeutic_map, geography_map, failed_lookups, checkpoint
+            )
 
 def main():
     if not os.path.exists(CSV_PATH):
@@ -174,17 +478,19 @@ def main():
     print(f"AIRTABLE SYNC WITH LINKED RECORDS")
     print(f"{'='*60}")
     print(f"\nLoading CSV: {CSV_PATH}")
-    rows = load_csv_rows(CSV_PATH)
-    print(f"Loaded {len(rows)} rows\n")
-    therapeutic_map, geography_map = setup_linked_records(rows)
-    updates, creates, errors = upsert_firms(rows, therapeutic_map, geography_map)
+    updates, creates, unchanged, errors = asyncio.run(run_sync(CSV_PATH))
     print(f"\n{'='*60}")
     print(f"SYNC COMPLETE!")
     print(f"{'='*60}")
-    print(f"  VC Firms Updated:  {updates}")
-    print(f"  VC Firms Created:  {creates}")
-    print(f"  Errors:            {errors}")
+    print(f"  VC Firms Updated:   {updates}")
+    print(f"  VC Firms Created:   {creates}")
+    print(f"  VC Firms Unchanged: {unchanged}")
+    print(f"  Errors:             {errors}")
     print(f"{'='*60}\n")
+    # The run finished, so start the next one from scratch. The checkpoint only survives
+    # an aborted run, and the unchanged-field check makes re-syncing already-written firms cheap
+    if os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
 
 if __name__ == "__main__":
     main()
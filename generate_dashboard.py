@@ -1,37 +1,65 @@
 ﻿import os
+import asyncio
 from dotenv import load_dotenv
-from pyairtable import Api
+from pyairtable import Api, retry_strategy
+from requests.adapters import HTTPAdapter
 import plotly.graph_objects as go
 import plotly.express as px
+from plotly.offline import get_plotlyjs_version
 from collections import Counter
 from datetime import datetime
+from lookup_cache import load_lookup, save_lookup
 
 load_dotenv()
 
+AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
+
 api = Api(os.getenv("AIRTABLE_TOKEN"))
-base = api.base(os.getenv("AIRTABLE_BASE_ID"))
+# fetch_dashboard_data reads three tables from worker threads at once; give them
+# enough pooled keep-alive connections, with pyairtable's 429 retry policy intact
+api.session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry_strategy()))
+base = api.base(AIRTABLE_BASE_ID)
 firms_table = base.table("Venture Capital Firms")
 therapeutic_table = base.table("Therapeutic Areas")
 geography_table = base.table("Geographic Regions")
 
-def fetch_lookup_tables():
-    """Fetch all lookup tables and create ID->Name mappings"""
+# Only the columns analyze_data reads
+ANALYTICS_FIELDS = [
+    "Therapeutic Areas of Focus",
+    "Geography Focus",
+    "Headquarters Country",
+    "Verified",
+    "Website",
+    "Description",
+]
+
+PLOTLY_CDN_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+# Above this many firms analyze_data switches to the pandas implementation
+PANDAS_THRESHOLD = 5000
+
+def fetch_lookup(table, name_field, cache_key):
+    """Fetch one lookup table as an ID->Name mapping"""
+    # Lookup tables change rarely; reuse the on-disk copy while it is fresh
+    mapping = load_lookup(AIRTABLE_BASE_ID, cache_key)
+    if mapping is None:
+        mapping = {}
+        for rec in table.all(fields=[name_field], page_size=100):
+            rec_id = rec["id"]
+            name = rec.get("fields", {}).get(name_field, "Unknown")
+            mapping[rec_id] = name
+        save_lookup(AIRTABLE_BASE_ID, cache_key, mapping)
+    return mapping
+
+async def fetch_lookup_tables():
+    """Fetch all lookup tables concurrently and create ID->Name mappings"""
     print("Fetching lookup tables...")
     
-    therapeutic_map = {}
-    geo_map = {}
-    
-    # Use correct field name: "Therapeutic Area Name"
-    for rec in therapeutic_table.all():
-        rec_id = rec["id"]
-        name = rec.get("fields", {}).get("Therapeutic Area Name", "Unknown")
-        therapeutic_map[rec_id] = name
-    
-    # Use correct field name: "Region Name"
-    for rec in geography_table.all():
-        rec_id = rec["id"]
-        name = rec.get("fields", {}).get("Region Name", "Unknown")
-        geo_map[rec_id] = name
+    # Use correct field names: "Therapeutic Area Name" / "Region Name"
+    therapeutic_map, geo_map = await asyncio.gather(
+        asyncio.to_thread(fetch_lookup, therapeutic_table, "Therapeutic Area Name", "therapeutic_map"),
+        asyncio.to_thread(fetch_lookup, geography_table, "Region Name", "geo_map"),
+    )
     
     print(f"  Loaded {len(therapeutic_map)} therapeutic areas")
     print(f"  Loaded {len(geo_map)} geographic regions")
@@ -40,39 +68,77 @@ def fetch_lookup_tables():
 
 def fetch_all_data():
     print("Fetching VC firms...")
-    records = firms_table.all()
+    records = firms_table.all(fields=ANALYTICS_FIELDS, page_size=100)
     print(f"Fetched {len(records)} VC firms")
     return records
 
+async def fetch_dashboard_data():
+    (therapeutic_map, geo_map), records = await asyncio.gather(
+        fetch_lookup_tables(),
+        asyncio.to_thread(fetch_all_data),
+    )
+    return therapeutic_map, geo_map, records
+
+def analyze_data_pandas(records, therapeutic_map, geo_map):
+    """Vectorized analyze_data for large record sets"""
+    import pandas as pd
+    
+    df = pd.DataFrame([rec.get("fields", {}) for rec in records], columns=ANALYTICS_FIELDS)
+    
+    def count_links(column, id_map):
+        # One row per linked ID, IDs converted to names
+        names = df[column].explode().dropna().map(id_map).fillna("Unknown")
+        return Counter({name: int(n) for name, n in names.value_counts().items()})
+    
+    def count_filled(column):
+        return int(df[column].fillna(False).astype(bool).sum())
+    
+    return {
+        "total_firms": len(records),
+        "therapeutics": count_links("Therapeutic Areas of Focus", therapeutic_map),
+        "geographies": count_links("Geography Focus", geo_map),
+        "countries": count_links("Headquarters Country", geo_map),
+        "verified_count": count_filled("Verified"),
+        "has_website": count_filled("Website"),
+        "has_description": count_filled("Description"),
+    }
+
 def analyze_data(records, therapeutic_map, geo_map):
     """Extract analytics from records"""
-    therapeutics = []
-    geographies = []
-    countries = []
+    if len(records) > PANDAS_THRESHOLD:
+        return analyze_data_pandas(records, therapeutic_map, geo_map)
+    
+    therapeutics = Counter()
+    geographies = Counter()
+    countries = Counter()
     verified_count = 0
     has_website = 0
     has_description = 0
     
+    # Bind field names and lookups once instead of per record/tag
+    therapeutic_field = "Therapeutic Areas of Focus"
+    geo_field = "Geography Focus"
+    country_field = "Headquarters Country"
+    therapeutic_name = therapeutic_map.get
+    geo_name = geo_map.get
+    update_therapeutics = therapeutics.update
+    update_geographies = geographies.update
+    update_countries = countries.update
+    
     for rec in records:
         fields = rec.get("fields", {})
         
         # Therapeutic areas - convert IDs to names
-        therapeutic_ids = fields.get("Therapeutic Areas of Focus", [])
-        for tid in therapeutic_ids:
-            name = therapeutic_map.get(tid, "Unknown")
-            therapeutics.append(name)
+        therapeutic_ids = fields.get(therapeutic_field, ())
+        update_therapeutics(therapeutic_name(tid, "Unknown") for tid in therapeutic_ids)
         
         # Geography - convert IDs to names
-        geo_ids = fields.get("Geography Focus", [])
-        for gid in geo_ids:
-            name = geo_map.get(gid, "Unknown")
-            geographies.append(name)
+        geo_ids = fields.get(geo_field, ())
+        update_geographies(geo_name(gid, "Unknown") for gid in geo_ids)
         
         # Countries - convert IDs to names
-        country_ids = fields.get("Headquarters Country", [])
-        for cid in country_ids:
-            name = geo_map.get(cid, "Unknown")
-            countries.append(name)
+        country_ids = fields.get(country_field, ())
+        update_countries(geo_name(cid, "Unknown") for cid in country_ids)
         
         # Data quality metrics
         if fields.get("Verified"):
@@ -84,109 +150,28 @@ def analyze_data(records, therapeutic_map, geo_map):
     
     return {
         "total_firms": len(records),
-        "therapeutics": Counter(therapeutics),
-        "geographies": Counter(geographies),
-        "countries": Counter(countries),
+        "therapeutics": therapeutics,
+        "geographies": geographies,
+        "countries": countries,
         "verified_count": verified_count,
         "has_website": has_website,
         "has_description": has_description,
     }
 
-def create_dashboard(analytics):
-    """Generate HTML dashboard with Plotly charts"""
+def create_dashboard(analytics, out):
+    """Write the HTML dashboard with Plotly charts to an open file"""
     
-    # Chart 1: Top Therapeutic Areas
-    therapeutic_top = analytics["therapeutics"].most_common(15)
-    if therapeutic_top:
-        fig1 = go.Figure(data=[
-            go.Bar(
-                x=[name for name, _ in therapeutic_top],
-                y=[count for _, count in therapeutic_top],
-                marker_color='rgb(55, 83, 109)',
-                text=[count for _, count in therapeutic_top],
-                textposition='auto',
-            )
-        ])
-        fig1.update_layout(
-            title="Top 15 Therapeutic Areas",
-            xaxis_title="Therapeutic Area",
-            yaxis_title="Number of VCs",
-            height=500,
-            xaxis={'tickangle': -45}
-        )
-        chart1_html = fig1.to_html(include_plotlyjs='cdn', div_id="chart1")
-    else:
-        chart1_html = "<p>No therapeutic area data available</p>"
-    
-    # Chart 2: Geographic Distribution
-    geo_top = analytics["geographies"].most_common(15)
-    if geo_top:
-        fig2 = px.pie(
-            names=[name for name, _ in geo_top],
-            values=[count for _, count in geo_top],
-            title="Geographic Focus Distribution (Top 15)"
-        )
-        fig2.update_traces(textposition='inside', textinfo='percent+label')
-        fig2.update_layout(height=500)
-        chart2_html = fig2.to_html(include_plotlyjs=False, div_id="chart2")
-    else:
-        chart2_html = "<p>No geography data available</p>"
-    
-    # Chart 3: Data Quality Metrics
-    fig3 = go.Figure(data=[
-        go.Bar(
-            x=['Verified', 'Has Website', 'Has Description'],
-            y=[
-                analytics["verified_count"],
-                analytics["has_website"],
-                analytics["has_description"]
-            ],
-            marker_color=['#2ecc71', '#3498db', '#9b59b6'],
-            text=[
-                f"{analytics['verified_count']}/{analytics['total_firms']}",
-                f"{analytics['has_website']}/{analytics['total_firms']}",
-                f"{analytics['has_description']}/{analytics['total_firms']}"
-            ],
-            textposition='auto',
-        )
-    ])
-    fig3.update_layout(
-        title="Data Quality Metrics",
-        yaxis_title="Count",
-        height=400,
-    )
-    chart3_html = fig3.to_html(include_plotlyjs=False, div_id="chart3")
-    
-    # Chart 4: Country Distribution
-    country_top = analytics["countries"].most_common(15)
-    if country_top:
-        fig4 = go.Figure(data=[
-            go.Bar(
-                x=[name for name, _ in country_top],
-                y=[count for _, count in country_top],
-                marker_color='rgb(26, 118, 255)',
-                text=[count for _, count in country_top],
-                textposition='auto',
-            )
-        ])
-        fig4.update_layout(
-            title="Top Countries by VC Headquarters",
-            xaxis_title="Country",
-            yaxis_title="Number of VCs",
-            height=400,
-            xaxis={'tickangle': -45}
-        )
-        chart4_html = fig4.to_html(include_plotlyjs=False, div_id="chart4")
-    else:
-        chart4_html = "<p>No country data available</p>"
+    # Figures are rendered client-side from their JSON in one script at the end
+    figures = []
     
     # HTML Template
-    html = f"""
+    out.write(f"""
     <!DOCTYPE html>
     <html>
     <head>
         <title>Biotech VC Analytics Dashboard</title>
         <meta charset="utf-8">
+        <script src="{PLOTLY_CDN_URL}" charset="utf-8"></script>
         <style>
             body {{
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
@@ -287,30 +272,131 @@ def create_dashboard(analytics):
             </div>
             
             <div class="charts">
-                <div class="chart-container">{chart1_html}</div>
-                <div class="chart-container">{chart2_html}</div>
-                <div class="chart-container">{chart3_html}</div>
-                <div class="chart-container">{chart4_html}</div>
+    """)
+    
+    # Chart 1: Top Therapeutic Areas
+    therapeutic_top = analytics["therapeutics"].most_common(15)
+    if therapeutic_top:
+        fig1 = go.Figure(data=[
+            go.Bar(
+                x=[name for name, _ in therapeutic_top],
+                y=[count for _, count in therapeutic_top],
+                marker_color='rgb(55, 83, 109)',
+                text=[count for _, count in therapeutic_top],
+                textposition='auto',
+            )
+        ])
+        fig1.update_layout(
+            title="Top 15 Therapeutic Areas",
+            xaxis_title="Therapeutic Area",
+            yaxis_title="Number of VCs",
+            height=500,
+            xaxis={'tickangle': -45}
+        )
+        figures.append(("chart1", fig1))
+        chart1_html = '<div id="chart1"></div>'
+    else:
+        chart1_html = "<p>No therapeutic area data available</p>"
+    out.write(f'\n                <div class="chart-container">{chart1_html}</div>')
+    
+    # Chart 2: Geographic Distribution
+    geo_top = analytics["geographies"].most_common(15)
+    if geo_top:
+        fig2 = px.pie(
+            names=[name for name, _ in geo_top],
+            values=[count for _, count in geo_top],
+            title="Geographic Focus Distribution (Top 15)"
+        )
+        fig2.update_traces(textposition='inside', textinfo='percent+label')
+        fig2.update_layout(height=500)
+        figures.append(("chart2", fig2))
+        chart2_html = '<div id="chart2"></div>'
+    else:
+        chart2_html = "<p>No geography data available</p>"
+    out.write(f'\n                <div class="chart-container">{chart2_html}</div>')
+    
+    # Chart 3: Data Quality Metrics
+    fig3 = go.Figure(data=[
+        go.Bar(
+            x=['Verified', 'Has Website', 'Has Description'],
+            y=[
+                analytics["verified_count"],
+                analytics["has_website"],
+                analytics["has_description"]
+            ],
+            marker_color=['#2ecc71', '#3498db', '#9b59b6'],
+            text=[
+                f"{analytics['verified_count']}/{analytics['total_firms']}",
+                f"{analytics['has_website']}/{analytics['total_firms']}",
+                f"{analytics['has_description']}/{analytics['total_firms']}"
+            ],
+            textposition='auto',
+        )
+    ])
+    fig3.update_layout(
+        title="Data Quality Metrics",
+        yaxis_title="Count",
+        height=400,
+    )
+    figures.append(("chart3", fig3))
+    chart3_html = '<div id="chart3"></div>'
+    out.write(f'\n                <div class="chart-container">{chart3_html}</div>')
+    
+    # Chart 4: Country Distribution
+    country_top = analytics["countries"].most_common(15)
+    if country_top:
+        fig4 = go.Figure(data=[
+            go.Bar(
+                x=[name for name, _ in country_top],
+                y=[count for _, count in country_top],
+                marker_color='rgb(26, 118, 255)',
+                text=[count for _, count in country_top],
+                textposition='auto',
+            )
+        ])
+        fig4.update_layout(
+            title="Top Countries by VC Headquarters",
+            xaxis_title="Country",
+            yaxis_title="Number of VCs",
+            height=400,
+            xaxis={'tickangle': -45}
+        )
+        figures.append(("chart4", fig4))
+        chart4_html = '<div id="chart4"></div>'
+    else:
+        chart4_html = "<p>No country data available</p>"
+    out.write(f'\n                <div class="chart-container">{chart4_html}</div>')
+    
+    # Closing HTML
+    out.write("""
             </div>
             
+            <script>
+                var figures = {""")
+    for div_id, fig in figures:
+        # Keep "</script>" inside string data from closing the tag
+        fig_json = fig.to_json().replace("</", "<\\/")
+        out.write(f'\n                    "{div_id}": {fig_json},')
+    out.write("""
+                };
+                for (var id in figures) {
+                    Plotly.newPlot(id, figures[id].data, figures[id].layout, {responsive: true});
+                }
+            </script>
+            
             <div class="footer">
                 <p>Generated by Python + Airtable API + Plotly</p>
             </div>
         </div>
     </body>
     </html>
-    """
-    
-    return html
+    """)
 
 def main():
     print("\n=== GENERATING ANALYTICS DASHBOARD ===\n")
     
-    # Fetch lookup tables first
-    therapeutic_map, geo_map = fetch_lookup_tables()
-    
-    # Fetch firm data
-    records = fetch_all_data()
+    # Fetch lookup tables and firm data concurrently
+    therapeutic_map, geo_map, records = asyncio.run(fetch_dashboard_data())
     
     # Analyze
     print("\nAnalyzing data...")
@@ -318,12 +404,9 @@ def main():
     
     # Generate dashboard
     print("Creating visualizations...")
-    html = create_dashboard(analytics)
-    
-    # Save to file
     output_file = "vc_dashboard.html"
     with open(output_file, "w", encoding="utf-8") as f:
-        f.write(html)
+        create_dashboard(analytics, f)
     
     print(f"\n✅ Dashboard created: {output_file}")
     print(f"📊 Total VCs: {analytics['total_firms']}")
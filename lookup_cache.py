@@ -0,0 +1,44 @@
+import os
+import json
+import time
+import threading
+
+CACHE_PATH = os.path.join(".cache", "airtable_lookups.json")
+CACHE_TTL = 3600
+
+# Lookups may be saved from worker threads; serialize the read-modify-write
+_write_lock = threading.Lock()
+
+def _read_cache():
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _cache_key(base_id, name):
+    # Record IDs are only valid within their own base
+    return f"{base_id}:{name}"
+
+def load_lookup(base_id, name):
+    """Return the cached ID->Name map for a lookup table, or None if missing/stale"""
+    key = _cache_key(base_id, name)
+    cache = _read_cache()
+    mtime = cache.get("mtime", {}).get(key, 0)
+    if key in cache and time.time() - mtime < CACHE_TTL:
+        return cache[key]
+    return None
+
+def save_lookup(base_id, name, mapping, refreshed=True):
+    """Write an ID->Name map to the cache; refreshed=False keeps its timestamp"""
+    key = _cache_key(base_id, name)
+    with _write_lock:
+        cache = _read_cache()
+        cache[key] = mapping
+        if refreshed:
+            cache.setdefault("mtime", {})[key] = time.time()
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        tmp_path = CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, CACHE_PATH)